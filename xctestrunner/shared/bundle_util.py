@@ -14,15 +14,31 @@
 
 """Utility methods for managing Apple bundles."""
 
+import ctypes
+import ctypes.util
 import glob
 import os
+import shutil
 import subprocess
+import sys
 import tempfile
 
 from xctestrunner.shared import ios_errors
 from xctestrunner.shared import plist_util
 
 
+_clonefile = None
+_clonefile_loaded = False
+
+# Caches keyed by bundle path. Reading these fields parses Info.plist or
+# shells out to codesign; the values do not change while the test runner is
+# working, so each bundle path only pays that cost once.
+_min_os_version_cache = {}
+_bundle_id_cache = {}
+_development_team_cache = {}
+_codesign_identity_cache = {}
+
+
 def ExtractApp(compressed_app_path, working_dir):
   """Creates a temp directory and extracts compressed file of the app there.
 
@@ -77,6 +93,52 @@ def ExtractTestBundle(compressed_test_path, working_dir):
     return _ExtractBundleFile('%s/Payload' % unzip_target_dir, 'xctest')
 
 
+def CopyDirectory(src_dir, des_dir):
+  """Copies the directory to the destination path.
+
+  On APFS volumes the copy is done with clonefile, which only allocates new
+  metadata and shares the data blocks with the source. It is the same
+  copy-on-write mechanism as `cp -c` and makes copying large bundles nearly
+  free. Falls back to `shutil.copytree` when cloning is not available.
+
+  Unlike shutil.copytree, the clone preserves symlinks inside the tree
+  instead of dereferencing them, so only use this for trees that are known
+  to be symlink-free (e.g. the XCTRunner.app and frameworks shipped with
+  Xcode) or where preserving the links is acceptable.
+
+  Args:
+    src_dir: string, full path of the directory to be copied.
+    des_dir: string, full path of the destination directory. It should not
+      exist yet.
+  """
+  clonefile = _GetClonefile()
+  if clonefile is not None:
+    # Paths may already be byte strings under Python 2; only unicode/str-3
+    # paths need encoding for the char* arguments.
+    src = src_dir if isinstance(src_dir, bytes) else src_dir.encode('utf-8')
+    des = des_dir if isinstance(des_dir, bytes) else des_dir.encode('utf-8')
+    if clonefile(src, des, 0) == 0:
+      return
+  shutil.copytree(src_dir, des_dir)
+
+
+def RemoveDirectory(dir_path):
+  """Removes the directory and everything under it.
+
+  Work directories can hold tens of thousands of files after a test session;
+  the native `rm -rf` removes them with batched unlinks in C and is much
+  faster than Python's shutil.rmtree walk. Falls back to shutil.rmtree when
+  the shell command fails.
+
+  Args:
+    dir_path: string, full path of the directory to be removed.
+  """
+  if os.name == 'posix':
+    if subprocess.call(['rm', '-rf', dir_path]) == 0:
+      return
+  shutil.rmtree(dir_path)
+
+
 def GetMinimumOSVersion(bundle_path):
   """Gets the minimum OS version of the bundle deployment.
 
@@ -90,8 +152,11 @@ def GetMinimumOSVersion(bundle_path):
     ios_errors.PlistError: the MinimumOSVersion does not exist in the bundle's
       Info.plist.
   """
-  info_plist = os.path.join(bundle_path, 'Info.plist')
-  return plist_util.Plist(info_plist).GetPlistField('MinimumOSVersion')
+  if bundle_path not in _min_os_version_cache:
+    info_plist = os.path.join(bundle_path, 'Info.plist')
+    _min_os_version_cache[bundle_path] = plist_util.Plist(
+        info_plist).GetPlistField('MinimumOSVersion')
+  return _min_os_version_cache[bundle_path]
 
 
 def GetBundleId(bundle_path):
@@ -107,8 +172,11 @@ def GetBundleId(bundle_path):
     ios_errors.PlistError: the CFBundleIdentifier does not exist in the bundle's
       Info.plist.
   """
-  info_plist = os.path.join(bundle_path, 'Info.plist')
-  return plist_util.Plist(info_plist).GetPlistField('CFBundleIdentifier')
+  if bundle_path not in _bundle_id_cache:
+    info_plist = os.path.join(bundle_path, 'Info.plist')
+    _bundle_id_cache[bundle_path] = plist_util.Plist(
+        info_plist).GetPlistField('CFBundleIdentifier')
+  return _bundle_id_cache[bundle_path]
 
 
 def GetCodesignIdentity(bundle_path):
@@ -124,13 +192,17 @@ def GetCodesignIdentity(bundle_path):
     ios_errors.BundleError: when failed to get the signing identity from the
       bundle.
   """
+  if bundle_path in _codesign_identity_cache:
+    return _codesign_identity_cache[bundle_path]
   command = ('codesign', '-dvv', bundle_path)
   process = subprocess.Popen(command, stdout=subprocess.PIPE,
                              stderr=subprocess.STDOUT)
   output = process.communicate()[0]
   for line in output.split('\n'):
     if line.startswith('Authority='):
-      return line[len('Authority='):]
+      identity = line[len('Authority='):]
+      _codesign_identity_cache[bundle_path] = identity
+      return identity
 
   raise ios_errors.BundleError('Failed to extract signing identity from %s' %
                                output)
@@ -149,13 +221,17 @@ def GetDevelopmentTeam(bundle_path):
     ios_errors.BundleError: when failed to get the development team from the
       bundle.
   """
+  if bundle_path in _development_team_cache:
+    return _development_team_cache[bundle_path]
   command = ('codesign', '-dvv', bundle_path)
   process = subprocess.Popen(command, stdout=subprocess.PIPE,
                              stderr=subprocess.STDOUT)
   output = process.communicate()[0]
   for line in output.split('\n'):
     if line.startswith('TeamIdentifier='):
-      return line[len('TeamIdentifier='):]
+      team = line[len('TeamIdentifier='):]
+      _development_team_cache[bundle_path] = team
+      return team
 
   raise ios_errors.BundleError('Failed to extract development team from %s' %
                                output)
@@ -227,6 +303,31 @@ def RemoveArchType(file_path, arch_type):
       ['/usr/bin/lipo', file_path, '-remove', arch_type, '-output', file_path])
 
 
+def _GetClonefile():
+  """Gets the clonefile function of libSystem.
+
+  Returns:
+    a ctypes function object of clonefile or None if clonefile is not
+      available on the current platform.
+  """
+  global _clonefile, _clonefile_loaded
+  if _clonefile_loaded:
+    return _clonefile
+  _clonefile_loaded = True
+  if sys.platform != 'darwin':
+    return None
+  try:
+    libsystem = ctypes.cdll.LoadLibrary(
+        ctypes.util.find_library('System') or '/usr/lib/libSystem.dylib')
+    clonefile = libsystem.clonefile
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    clonefile.restype = ctypes.c_int
+    _clonefile = clonefile
+  except (OSError, AttributeError):
+    _clonefile = None
+  return _clonefile
+
+
 def _ExtractBundleFile(target_dir, bundle_extension):
   """Extract single bundle file with given extension.
 
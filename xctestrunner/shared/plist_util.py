@@ -42,6 +42,11 @@ class Plist(object):
     self._plist_file_path = plist_file_path
     # Module to read the .plist file.
     self._plistlib_module = _GetPlistLibModule(plist_file_path)
+    # The root object of the .plist file. It is parsed on first access and
+    # reused afterwards, so repeated get/set calls on the same Plist object
+    # only deserialize the file once. Mutations are written through to disk.
+    self._plist_root_object = None
+    self._root_object_loaded = False
 
   def GetPlistField(self, field):
     """View specific field in the .plist file.
@@ -61,8 +66,7 @@ class Plist(object):
     """
     if self._plistlib_module is None:
       return _GetPlistFieldByPlistBuddy(self._plist_file_path, field)
-    plist_root_object = self._plistlib_module.readPlist(self._plist_file_path)
-    return _GetObjectWithField(plist_root_object, field)
+    return _GetObjectWithField(self._GetRootObject(), field)
 
   def HasPlistField(self, field):
     """Checks whether a specific field is in the .plist file.
@@ -103,26 +107,45 @@ class Plist(object):
       return
     if not field:
       self._plistlib_module.writePlist(value, self._plist_file_path)
+      self._plist_root_object = value
+      self._root_object_loaded = True
       return
 
-    if os.path.exists(self._plist_file_path):
-      plist_root_object = self._plistlib_module.readPlist(self._plist_file_path)
+    if self._root_object_loaded or os.path.exists(self._plist_file_path):
+      plist_root_object = self._GetRootObject()
     else:
       plist_root_object = {}
-    keys_in_field = field.rsplit(':', 1)
-    if len(keys_in_field) == 1:
-      key = field
-      target_object = plist_root_object
+      self._plist_root_object = plist_root_object
+      self._root_object_loaded = True
+    _SetObjectWithField(plist_root_object, field, value)
+    self._plistlib_module.writePlist(plist_root_object, self._plist_file_path)
+
+  def SetPlistFields(self, fields_to_values):
+    """Sets multiple fields with provided values in .plist file.
+
+    The .plist file is only serialized and written once after all the fields
+    are applied, instead of once per field.
+
+    Args:
+      fields_to_values: dict, the keys are fields (in the format described in
+          SetPlistField) and the values are the objects to set the fields to.
+
+    Raises:
+      ios_errors.PlistError: a field does not exist in the .plist file's dict.
+    """
+    if self._plistlib_module is None:
+      for field, value in fields_to_values.items():
+        _SetPlistFieldByPlistBuddy(self._plist_file_path, field, value)
+      return
+
+    if self._root_object_loaded or os.path.exists(self._plist_file_path):
+      plist_root_object = self._GetRootObject()
     else:
-      key = keys_in_field[1]
-      target_object = _GetObjectWithField(plist_root_object, keys_in_field[0])
-    try:
-      target_object[_ParseKey(target_object, key)] = value
-    except ios_errors.PlistError as e:
-      raise e
-    except (KeyError, IndexError):
-      raise ios_errors.PlistError('Failed to set key %s from object %s.'
-                                  % (key, target_object))
+      plist_root_object = {}
+      self._plist_root_object = plist_root_object
+      self._root_object_loaded = True
+    for field, value in fields_to_values.items():
+      _SetObjectWithField(plist_root_object, field, value)
     self._plistlib_module.writePlist(plist_root_object, self._plist_file_path)
 
   def DeletePlistField(self, field):
@@ -142,7 +165,7 @@ class Plist(object):
       _DeletePlistFieldByPlistBuddy(self._plist_file_path, field)
       return
 
-    plist_root_object = self._plistlib_module.readPlist(self._plist_file_path)
+    plist_root_object = self._GetRootObject()
     keys_in_field = field.rsplit(':', 1)
     if len(keys_in_field) == 1:
       key = field
@@ -161,6 +184,19 @@ class Plist(object):
 
     self._plistlib_module.writePlist(plist_root_object, self._plist_file_path)
 
+  def _GetRootObject(self):
+    """Gets the root object of the .plist file.
+
+    Returns:
+      the parsed root object, from the in-memory copy when the file has been
+        read before.
+    """
+    if not self._root_object_loaded:
+      self._plist_root_object = self._plistlib_module.readPlist(
+          self._plist_file_path)
+      self._root_object_loaded = True
+    return self._plist_root_object
+
 
 def _GetObjectWithField(target_object, field):
   """Gets sub object of the object with field.
@@ -196,6 +232,39 @@ def _GetObjectWithField(target_object, field):
   return current_object
 
 
+def _SetObjectWithField(target_object, field, value):
+  """Sets the field of the object with the provided value.
+
+  Args:
+    target_object: the target object.
+    field: string, the field consist of property key names delimited by
+        colons. List(array) items are specified by a zero-based integer index.
+        Examples
+          :CFBundleShortVersionString
+          :CFBundleDocumentTypes:2:CFBundleTypeExtensions
+    value: a object, the value of the field to be set. It can be integer,
+        bool, string, array, dict.
+
+  Raises:
+    ios_errors.PlistError: the field does not exist in the object or the field
+      is invaild.
+  """
+  keys_in_field = field.rsplit(':', 1)
+  if len(keys_in_field) == 1:
+    key = field
+    sub_object = target_object
+  else:
+    key = keys_in_field[1]
+    sub_object = _GetObjectWithField(target_object, keys_in_field[0])
+  try:
+    sub_object[_ParseKey(sub_object, key)] = value
+  except ios_errors.PlistError as e:
+    raise e
+  except (KeyError, IndexError):
+    raise ios_errors.PlistError('Failed to set key %s from object %s.'
+                                % (key, sub_object))
+
+
 def _ParseKey(target_object, key):
   """Parses the key value according target object type.
 
@@ -51,6 +51,25 @@ _TOO_MANY_INSTANCES_ALREADY_RUNNING = ('Too many instances of this service are '
 _LOST_CONNECTION_ERROR = 'Lost connection to testmanagerd'
 _LOST_CONNECTION_TO_DTSERVICEHUB_ERROR = 'Lost connection to DTServiceHub'
 
+_run_env = None
+
+
+def _GetRunEnv():
+  """Gets the environment to run xcodebuild with unbuffered output.
+
+  The merged environment is computed once and cached to avoid copying the
+  whole process environment on every execution. It is expected that no one
+  changes the process environment during the test runner working.
+
+  Returns:
+    dict, the environment variables to run the xcodebuild command with.
+  """
+  global _run_env
+  if _run_env is None:
+    _run_env = dict(os.environ)
+    _run_env['NSUnbufferedIO'] = 'YES'
+  return _run_env
+
 
 class CheckXcodebuildStuckThread(threading.Thread):
   """The thread class that checking if xcodebuild process stucks.
@@ -142,8 +161,7 @@ class XcodebuildTestExecutor(object):
         output: the output of xcodebuild test command or None if return_output
             is False.
     """
-    run_env = dict(os.environ)
-    run_env['NSUnbufferedIO'] = 'YES'
+    run_env = _GetRunEnv()
     max_attempts = 1
     sim_log_path = None
     if self._sdk == ios_constants.SDK.IPHONESIMULATOR:
@@ -158,6 +176,21 @@ class XcodebuildTestExecutor(object):
     test_succeeded = False
     test_failed = False
 
+    # The pipe of the subprocess yields raw bytes. Encode the signals once
+    # here so each line scan compares bytes against bytes, instead of mixing
+    # the types (which Python 3 rejects) or re-encoding per line.
+    succeeded_signal = (
+        self._succeeded_signal.encode('utf-8')
+        if self._succeeded_signal else None)
+    failed_signal = (
+        self._failed_signal.encode('utf-8') if self._failed_signal else None)
+    test_started_signal = ios_constants.TEST_STARTED_SIGNAL.encode('utf-8')
+    xctrunner_started_signal = ios_constants.XCTRUNNER_STARTED_SIGNAL.encode(
+        'utf-8')
+    # sys.stdout is a text stream under Python 3; echo the raw bytes through
+    # its underlying buffer. Python 2's sys.stdout accepts bytes directly.
+    stdout_writer = getattr(sys.stdout, 'buffer', sys.stdout)
+
     for i in range(max_attempts):
       process = subprocess.Popen(
           self._command, env=run_env, stdout=subprocess.PIPE,
@@ -166,12 +199,12 @@ class XcodebuildTestExecutor(object):
           process, self._startup_timeout_sec)
       check_xcodebuild_stuck.start()
       output = io.BytesIO()
-      for stdout_line in iter(process.stdout.readline, ''):
+      for stdout_line in iter(process.stdout.readline, b''):
         if not test_started:
           # Terminates the CheckXcodebuildStuckThread when test has started
           # or XCTRunner.app has started.
           # But XCTRunner.app start does not mean test start.
-          if ios_constants.TEST_STARTED_SIGNAL in stdout_line:
+          if test_started_signal in stdout_line:
             test_started = True
             check_xcodebuild_stuck.Terminate()
           # Only terminate the check_xcodebuild_stuck thread when running on
@@ -179,16 +212,21 @@ class XcodebuildTestExecutor(object):
           # XCTRunner.app may not launch the test session sometimes
           # (error rate < 1%).
           if (self._test_type == ios_constants.TestType.XCUITEST and
-              ios_constants.XCTRUNNER_STARTED_SIGNAL in stdout_line and
+              xctrunner_started_signal in stdout_line and
               self._sdk == ios_constants.SDK.IPHONESIMULATOR):
             check_xcodebuild_stuck.Terminate()
         else:
-          if self._succeeded_signal and self._succeeded_signal in stdout_line:
+          # Each signal appears at most once, so stop scanning the remaining
+          # output for a signal once it has been seen. The lines themselves
+          # still stream through for the console echo below.
+          if (succeeded_signal and not test_succeeded and
+              succeeded_signal in stdout_line):
             test_succeeded = True
-          if self._failed_signal and self._failed_signal in stdout_line:
+          if (failed_signal and not test_failed and
+              failed_signal in stdout_line):
             test_failed = True
 
-        sys.stdout.write(stdout_line)
+        stdout_writer.write(stdout_line)
         sys.stdout.flush()
         # If return_output is false, the output is only used for checking error
         # cause and deleting cached files (_DeleteTestCacheFileDirs method).
@@ -196,6 +234,10 @@ class XcodebuildTestExecutor(object):
           output.write(stdout_line)
 
       try:
+        # The buffered output is decoded once here; everything downstream
+        # (error-cause searches, cache-dir cleanup, returned output) works
+        # on str.
+        output_str = output.getvalue().decode('utf-8', 'replace')
         if test_started:
           if test_succeeded:
             exit_code = runner_exit_codes.EXITCODE.SUCCEEDED
@@ -203,13 +245,12 @@ class XcodebuildTestExecutor(object):
             exit_code = runner_exit_codes.EXITCODE.FAILED
           else:
             exit_code = runner_exit_codes.EXITCODE.ERROR
-          return exit_code, output.getvalue() if return_output else None
+          return exit_code, output_str if return_output else None
 
         check_xcodebuild_stuck.Terminate()
         if check_xcodebuild_stuck.is_xcodebuild_stuck:
-          return self._GetResultForXcodebuildStuck(output, return_output)
+          return self._GetResultForXcodebuildStuck(output_str, return_output)
 
-        output_str = output.getvalue()
         if self._sdk == ios_constants.SDK.IPHONEOS:
           if ((re.search(_DEVICE_TYPE_WAS_NULL_PATTERN, output_str) or
                _LOST_CONNECTION_ERROR in output_str or
@@ -267,15 +308,14 @@ class XcodebuildTestExecutor(object):
         return (runner_exit_codes.EXITCODE.TEST_NOT_START,
                 output_str if return_output else None)
       finally:
-        _DeleteTestCacheFileDirs(output.getvalue(), self._sdk, self._test_type)
+        _DeleteTestCacheFileDirs(output_str, self._sdk, self._test_type)
 
-  def _GetResultForXcodebuildStuck(self, output, return_output):
+  def _GetResultForXcodebuildStuck(self, output_str, return_output):
     """Gets the execution result for the xcodebuild stuck case."""
     error_message = ('xcodebuild command can not launch test on '
                      'device/simulator in %ss.' % self._startup_timeout_sec)
     logging.error(error_message)
-    output.write(error_message)
-    output_str = output.getvalue()
+    output_str += error_message
     if self._sdk == ios_constants.SDK.IPHONEOS:
       return (runner_exit_codes.EXITCODE.NEED_REBOOT_DEVICE,
               output_str if return_output else None)
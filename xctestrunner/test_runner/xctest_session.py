@@ -238,10 +238,10 @@ class XctestSession(object):
     """Deletes the temp directories."""
     if (self._delete_work_dir and self._work_dir and
         os.path.exists(self._work_dir)):
-      shutil.rmtree(self._work_dir)
+      bundle_util.RemoveDirectory(self._work_dir)
     if (self._delete_output_dir and self._output_dir and
         os.path.exists(self._output_dir)):
-      shutil.rmtree(self._output_dir)
+      bundle_util.RemoveDirectory(self._output_dir)
 
 
 def _PrepareBundles(working_dir, app_under_test_path, test_bundle_path):
@@ -282,13 +282,21 @@ def _PrepareBundles(working_dir, app_under_test_path, test_bundle_path):
     app_under_test_dir = os.path.join(
         working_dir,
         os.path.splitext(os.path.basename(app_under_test_path))[0] + '.app')
+    if _IsPreparedBundleStale(app_under_test_path, app_under_test_dir):
+      bundle_util.RemoveDirectory(app_under_test_dir)
     if not os.path.exists(app_under_test_dir):
       if app_under_test_path.endswith('.ipa'):
         extract_app_under_test_dir = bundle_util.ExtractApp(
             app_under_test_path, working_dir)
         shutil.move(extract_app_under_test_dir, app_under_test_dir)
+        # unzip restores the timestamps archived inside the .ipa, which
+        # predate the archive itself; stamp the extraction time so the
+        # staleness check against the source archive works on later runs.
+        os.utime(app_under_test_dir, None)
       elif not os.path.abspath(app_under_test_path).startswith(working_dir):
         # Only copies the app under test if it is not in working directory.
+        # The staged copy gets installed later; copytree dereferences any
+        # symlinks inside the user-supplied bundle so it is self-contained.
         shutil.copytree(app_under_test_path, app_under_test_dir)
       else:
         app_under_test_dir = app_under_test_path
@@ -306,13 +314,21 @@ def _PrepareBundles(working_dir, app_under_test_path, test_bundle_path):
   test_bundle_dir = os.path.join(
       working_dir,
       os.path.splitext(os.path.basename(test_bundle_path))[0] + '.xctest')
+  if _IsPreparedBundleStale(test_bundle_path, test_bundle_dir):
+    bundle_util.RemoveDirectory(test_bundle_dir)
   if not os.path.exists(test_bundle_dir):
     if test_bundle_path.endswith('.ipa') or test_bundle_path.endswith('.zip'):
       extract_test_bundle_dir = bundle_util.ExtractTestBundle(
           test_bundle_path, working_dir)
       shutil.move(extract_test_bundle_dir, test_bundle_dir)
+      # unzip restores the timestamps archived inside the .ipa/.zip, which
+      # predate the archive itself; stamp the extraction time so the
+      # staleness check against the source archive works on later runs.
+      os.utime(test_bundle_dir, None)
     elif not os.path.abspath(test_bundle_path).startswith(working_dir):
       # Only copies the test bundle if it is not in working directory.
+      # The staged copy gets installed later; copytree dereferences any
+      # symlinks inside the user-supplied bundle so it is self-contained.
       shutil.copytree(test_bundle_path, test_bundle_dir)
     else:
       test_bundle_dir = test_bundle_path
@@ -320,6 +336,34 @@ def _PrepareBundles(working_dir, app_under_test_path, test_bundle_path):
   return app_under_test_dir, test_bundle_dir
 
 
+def _IsPreparedBundleStale(src_bundle_path, prepared_bundle_dir):
+  """Checks whether the prepared bundle under work directory is stale.
+
+  A bundle prepared by an earlier session is reused as-is; if the caller has
+  rebuilt the source bundle since then, the prepared copy must be refreshed
+  instead of silently reusing the outdated one. Bundles extracted from an
+  archive are stamped with their extraction time, so the comparison holds
+  for .ipa/.zip sources too. A directory source rebuilt in place without
+  its own mtime changing is still not detected as stale.
+
+  Args:
+    src_bundle_path: string, the path of the original bundle (.app/.xctest
+        directory or .ipa/.zip file).
+    prepared_bundle_dir: string, the path of the prepared bundle under work
+        directory.
+
+  Returns:
+    boolean, whether the prepared bundle exists but is older than the source
+      bundle. Always False when both paths refer to the same file.
+  """
+  if not os.path.exists(prepared_bundle_dir):
+    return False
+  if os.path.samefile(src_bundle_path, prepared_bundle_dir):
+    return False
+  return os.path.getmtime(src_bundle_path) > os.path.getmtime(
+      prepared_bundle_dir)
+
+
 def _FinalizeTestType(
     test_bundle_dir, sdk, app_under_test_dir=None, original_test_type=None):
   """Finalizes the test type of the test session according to the args.
@@ -376,8 +420,21 @@ def _DetectTestType(test_bundle_dir):
   """Detects if the test bundle is XCUITest or XCTest."""
   test_bundle_exec_path = os.path.join(
       test_bundle_dir, os.path.splitext(os.path.basename(test_bundle_dir))[0])
-  output = subprocess.check_output(['nm', test_bundle_exec_path])
-  if 'XCUIApplication' in output:
+  # The nm output can be tens of MB for a large test bundle. Streams the
+  # output and stops at the first XCUIApplication symbol instead of buffering
+  # the whole symbol table in memory.
+  command = ['nm', test_bundle_exec_path]
+  process = subprocess.Popen(command, stdout=subprocess.PIPE)
+  is_xcuitest = False
+  for line in iter(process.stdout.readline, b''):
+    if b'XCUIApplication' in line:
+      is_xcuitest = True
+      break
+  process.stdout.close()
+  return_code = process.wait()
+  if return_code != 0 and not is_xcuitest:
+    raise subprocess.CalledProcessError(return_code, command)
+  if is_xcuitest:
     return ios_constants.TestType.XCUITEST
   else:
     return ios_constants.TestType.XCTEST
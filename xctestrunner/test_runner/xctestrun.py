@@ -298,7 +298,12 @@ class XctestRunFactory(object):
     """
     self._app_under_test_dir = app_under_test_dir
     self._test_bundle_dir = test_bundle_dir
+    # The bundle directories are moved under test root later, but their
+    # basenames never change, so the derived names are computed once here.
     self._test_name = os.path.splitext(os.path.basename(test_bundle_dir))[0]
+    self._app_under_test_name = (
+        os.path.splitext(os.path.basename(app_under_test_dir))[0]
+        if app_under_test_dir else None)
     self._sdk = sdk
     self._device_arch = device_arch
     self._test_type = test_type
@@ -390,7 +395,7 @@ class XctestRunFactory(object):
   def Close(self):
     """Deletes the temp directories."""
     if self._delete_work_dir and os.path.exists(self._work_dir):
-      shutil.rmtree(self._work_dir)
+      bundle_util.RemoveDirectory(self._work_dir)
 
   def _ValidateArguments(self):
     """Checks whether the arguments of this class are valid.
@@ -524,14 +529,12 @@ class XctestRunFactory(object):
     Returns:
       A string, the path of uitest runner app.
     """
-    test_bundle_name = os.path.splitext(
-        os.path.basename(self._test_bundle_dir))[0]
     xctrunner_app = os.path.join(
         platform_library_path, 'Xcode/Agents/XCTRunner.app')
-    uitest_runner_app_name = '%s-Runner' % test_bundle_name
+    uitest_runner_app_name = '%s-Runner' % self._test_name
     uitest_runner_app = os.path.join(self._test_root_dir,
                                      uitest_runner_app_name + '.app')
-    shutil.copytree(xctrunner_app, uitest_runner_app)
+    bundle_util.CopyDirectory(xctrunner_app, uitest_runner_app)
     uitest_runner_exec = os.path.join(uitest_runner_app, uitest_runner_app_name)
     shutil.move(
         os.path.join(uitest_runner_app, 'XCTRunner'), uitest_runner_exec)
@@ -541,18 +544,18 @@ class XctestRunFactory(object):
     # launched. So removing the arm64e arch from XCTRunner can resolve this
     # case.
     if self._device_arch == ios_constants.ARCH.ARM64E:
-      test_executable = os.path.join(self._test_bundle_dir, test_bundle_name)
+      test_executable = os.path.join(self._test_bundle_dir, self._test_name)
       test_archs = bundle_util.GetFileArchTypes(test_executable)
       if ios_constants.ARCH.ARM64E not in test_archs:
         bundle_util.RemoveArchType(uitest_runner_exec,
                                    ios_constants.ARCH.ARM64E)
 
     runner_app_info_plist_path = os.path.join(uitest_runner_app, 'Info.plist')
-    info_plist = plist_util.Plist(runner_app_info_plist_path)
-    info_plist.SetPlistField('CFBundleName', uitest_runner_app_name)
-    info_plist.SetPlistField('CFBundleExecutable', uitest_runner_app_name)
-    info_plist.SetPlistField('CFBundleIdentifier',
-                             'com.apple.test.' + uitest_runner_app_name)
+    plist_util.Plist(runner_app_info_plist_path).SetPlistFields({
+        'CFBundleName': uitest_runner_app_name,
+        'CFBundleExecutable': uitest_runner_app_name,
+        'CFBundleIdentifier': 'com.apple.test.' + uitest_runner_app_name,
+    })
 
     return uitest_runner_app
 
@@ -563,7 +566,9 @@ class XctestRunFactory(object):
     # The test bundle should not exist under the new runner.app.
     if os.path.islink(self._test_bundle_dir):
       # The test bundle under PlugIns can not be symlink since it will cause
-      # app installation error.
+      # app installation error. shutil.copytree also dereferences the symlinks
+      # inside the bundle, so the copy is self-contained; cloning would
+      # preserve them.
       new_test_bundle_path = os.path.join(
           runner_app_plugins_dir, os.path.basename(self._test_bundle_dir))
       shutil.copytree(self._test_bundle_dir, new_test_bundle_path)
@@ -578,6 +583,7 @@ class XctestRunFactory(object):
     The approach constructs xctestrun.plist from Xcode. Then copies app under
     test, test bundle and xctestrun.plist to test root directory.
     """
+    xcode_version_num = xcode_info_util.GetXcodeVersionNumber()
     app_under_test_plugins_dir = os.path.join(
         self._app_under_test_dir, 'PlugIns')
     if not os.path.exists(app_under_test_plugins_dir):
@@ -585,7 +591,9 @@ class XctestRunFactory(object):
     new_test_bundle_path = os.path.join(
         app_under_test_plugins_dir, os.path.basename(self._test_bundle_dir))
     # The test bundle under PlugIns can not be symlink since it will cause
-    # app installation error.
+    # app installation error. shutil.copytree also dereferences the symlinks
+    # inside the bundle, so the copy is self-contained; cloning would preserve
+    # them.
     if os.path.islink(self._test_bundle_dir):
       shutil.copytree(self._test_bundle_dir, new_test_bundle_path)
       self._test_bundle_dir = new_test_bundle_path
@@ -605,7 +613,6 @@ class XctestRunFactory(object):
           os.path.join(platform_path,
                        'Developer/Library/Frameworks/XCTest.framework'),
           app_under_test_frameworks_dir, app_under_test_signing_identity)
-      xcode_version_num = xcode_info_util.GetXcodeVersionNumber()
       if xcode_version_num < 1000:
         bundle_injection_lib = os.path.join(
             platform_path, 'Developer/Library/PrivateFrameworks/'
@@ -630,19 +637,17 @@ class XctestRunFactory(object):
       bundle_util.CodesignBundle(self._test_bundle_dir)
       bundle_util.CodesignBundle(self._app_under_test_dir)
 
-    app_under_test_name = os.path.splitext(
-        os.path.basename(self._app_under_test_dir))[0]
     platform_name = 'iPhoneOS' if self._on_device else 'iPhoneSimulator'
     developer_path = '__PLATFORMS__/%s.platform/Developer' % platform_name
 
     if self._on_device:
-      if xcode_info_util.GetXcodeVersionNumber() < 1000:
+      if xcode_version_num < 1000:
         dyld_insert_libs = ('__TESTHOST__/Frameworks/'
                             'IDEBundleInjection.framework/IDEBundleInjection')
       else:
         dyld_insert_libs = '__TESTHOST__/Frameworks/libXCTestBundleInject.dylib'
     else:
-      if xcode_info_util.GetXcodeVersionNumber() < 1000:
+      if xcode_version_num < 1000:
         dyld_insert_libs = ('%s/Library/PrivateFrameworks/'
                             'IDEBundleInjection.framework/IDEBundleInjection' %
                             developer_path)
@@ -650,7 +655,8 @@ class XctestRunFactory(object):
         dyld_insert_libs = ('%s/usr/lib/libXCTestBundleInject.dylib' %
                             developer_path)
     test_envs = {
-        'XCInjectBundleInto': os.path.join('__TESTHOST__', app_under_test_name),
+        'XCInjectBundleInto': os.path.join('__TESTHOST__',
+                                           self._app_under_test_name),
         'DYLD_FRAMEWORK_PATH': '__TESTROOT__:{developer}/Library/Frameworks:'
                                '{developer}/Library/PrivateFrameworks'.format(
                                    developer=developer_path),
@@ -700,7 +706,7 @@ def _CopyAndSignFramework(src_framework, target_parent_dir, signing_identity):
   target_path = os.path.join(target_parent_dir, file_name)
   if os.path.exists(target_path):
     shutil.rmtree(target_path)
-  shutil.copytree(src_framework, target_path)
+  bundle_util.CopyDirectory(src_framework, target_path)
   bundle_util.CodesignBundle(target_path, identity=signing_identity)
 
 